@@ -1,85 +1,59 @@
 import cv2
-import serial
 import sys
 import time
+from jb_gantry import initialize_arduino, pickup_sequence, send_gcode as gantry_send_gcode
+from jb_journal import PickJournal
+from jb_overlay import draw_markers
+from jb_predictions import aggregate_predictions
 from roboflowoak import RoboflowOak
 from PyQt5.QtCore import Qt, QTimer, QRect
 from PyQt5.QtGui import QImage, QPixmap
 from PyQt5.QtWidgets import QApplication, QMainWindow, QPushButton, QVBoxLayout, QWidget, QLabel, QFrame, QTextEdit, QHBoxLayout, QTableWidget, QTableWidgetItem, QHeaderView
 
-class MockArduino:
-    def __init__(self):
-        print("Initialized Mock Arduino for testing")
-        self.is_mock = True
-        
-    def write(self, command):
-        print(f"Mock Arduino received command: {command.decode().strip()}")
-        return True
-        
-    def readline(self):
-        return b"ok\n"
-        
-    def close(self):
-        print("Mock Arduino connection closed")
-
-def initialize_arduino(port="/dev/ttyACM0", baud_rate=9600):
-    try:
-        arduino = serial.Serial(port, baud_rate)
-        print(f"Connected to real Arduino on {port}")
-        arduino.is_mock = False
-        return arduino
-    except serial.SerialException as e:
-        print(f"Arduino not found on {port}: {e}")
-        print("Initializing Mock Arduino for testing")
-        return MockArduino()
-
+station_name = "station1"
 port = "/dev/ttyACM0"
 baud_rate = 9600
 command_delay = 1
-arduino = initialize_arduino(port, baud_rate)
+journal_path = "picks.db"
+arduino = None
 
-machine_dimensions = [(0, 3.45), (0, 3.6), (0, 0.325)]
-mmpp = [0.41, -0.41]
-offsets = [150, 262]
+def connect_arduino():
+    # Connect on first use so importing this module never touches the serial port
+    global arduino
+    if arduino is None:
+        arduino = initialize_arduino(port, baud_rate)
+    return arduino
 
 def send_gcode(command):
-    command = str.encode(command.strip() + '\n')
-    arduino.write(command)
-    response = arduino.readline()
-    if not getattr(arduino, 'is_mock', False):
-        time.sleep(command_delay)
-    return response.strip()
-
-def pickup_sequence(x, y):
-    return [
-        f"G01 x{((mmpp[0]*x)+offsets[0])/100} y{((mmpp[1]*y)+offsets[1])/100} f300",
-        "M08",
-        f"G01 z{machine_dimensions[2][1]} f300",
-        "G01 z0 f300",
-        "G01 x0 y0 f300",
-        "M09"
-    ]
+    return gantry_send_gcode(connect_arduino(), command, command_delay)
 
 class OAK_GUI(QMainWindow):
-    def __init__(self, video_scale=0.6):
+    def __init__(self, video_scale=0.6, frame_source=None):
         super().__init__()
+        connect_arduino()
 
-        print("Initializing RoboflowOak...")
+        # frame_source replaces the OAK camera, e.g. a ReplayFrameSource
         self.roboflowoak_active = True
-        try:
-            self.roboflowoak = RoboflowOak(model="jellybelly5", confidence=0.10, overlap=0.5,
-                                version="1", api_key="##INSERT YOUR API KEY HERE###", rgb=True,
-                                depth=False, device=None, blocking=True)
-        except:
-            print("RoboflowOak initialization failed!")
-            self.roboflowoak_active = False
+        if frame_source is not None:
+            self.roboflowoak = frame_source
+        else:
+            print("Initializing RoboflowOak...")
+            try:
+                self.roboflowoak = RoboflowOak(model="jellybelly5", confidence=0.10, overlap=0.5,
+                                    version="1", api_key="##INSERT YOUR API KEY HERE###", rgb=True,
+                                    depth=False, device=None, blocking=True)
+            except:
+                print("RoboflowOak initialization failed!")
+                self.roboflowoak_active = False
         
         self.video_running = False
         self.snapshot_mode = False
         self.flavor_coordinates = {}
+        self.flavor_confidences = {}
         self.video_scale = video_scale
         self.last_message = ""
         self.snapshot_frame = None
+        self.journal = PickJournal(journal_path)
         
         print("Initializing UI...")
         self.initUI()
@@ -102,7 +76,6 @@ class OAK_GUI(QMainWindow):
 
         button_layout = QVBoxLayout()
         button_layout.setSpacing(3)
-        table_layout.QVBoxLayout()
 
         # Video frame with reduced size
         self.video_frame = QLabel()
@@ -245,15 +218,23 @@ class OAK_GUI(QMainWindow):
                 send_gcode("Wakeup... or else...")
                 time.sleep(2)
 
-                self.display_message("Picking up: " + selected_flavor)
-                for command in gcode_commands:
-                    self.display_message("Sending:\t" + command)
-                    send_gcode(command)
+                confidence = self.flavor_confidences.get(selected_flavor)
+                self.run_pickup(selected_flavor, x, y, confidence, gcode_commands)
             else:
                 self.display_message("That flavor's coordinates don't exist!")
         else:
             self.display_message("No flavor selected!")
 
+    def run_pickup(self, flavor, x, y, confidence, gcode_commands):
+        started = time.time()
+        self.display_message("Picking up: " + flavor)
+        success = True
+        for command in gcode_commands:
+            self.display_message("Sending:\t" + command)
+            success = send_gcode(command) == b"ok" and success
+        self.journal.record(flavor, success, station=station_name, confidence=confidence, x=x, y=y,
+                            started=started, cycle_time=time.time() - started)
+
     def auto_pick(self):
         while self.predictions_table.item(0,0):
             self.snapshot()
@@ -261,10 +242,8 @@ class OAK_GUI(QMainWindow):
             coords = self.predictions_table.item(0,2).text().split(",")
             gcode_commands = pickup_sequence(int(coords[0]), int(coords[1]))
 
-            self.display_message("Picking up: " + bean)
-            for command in gcode_commands:
-                self.display_message("Sending:\t" + command)
-                send_gcode(command)
+            confidence = self.flavor_confidences.get(bean)
+            self.run_pickup(bean, int(coords[0]), int(coords[1]), confidence, gcode_commands)
 
             self.start_video()
             self.update_frame()
@@ -284,6 +263,23 @@ class OAK_GUI(QMainWindow):
         self.display_message("Resetting machine...")
         send_gcode("$x")
   
+    def populate_table(self, flavor_stats):
+        # Fills the table and returns the marker position of each row
+        markers = []
+        self.predictions_table.setRowCount(len(flavor_stats))
+
+        for i, (flavor, count, avg_conf) in enumerate(flavor_stats):
+            coords = self.flavor_coordinates.get(flavor, ('N/A', 'N/A'))
+            x = abs(int(640-coords[0]))
+            y = abs(int(640-coords[1]))
+
+            self.predictions_table.setItem(i, 0, QTableWidgetItem(flavor))
+            self.predictions_table.setItem(i, 1, QTableWidgetItem(f"{avg_conf:.2f}"))
+            self.predictions_table.setItem(i, 2, QTableWidgetItem(f"{x}, {y}"))
+            markers.append((x, y))
+
+        return markers
+
     def update_frame(self):
         if not self.video_running:
             if self.snapshot_mode and self.snapshot_frame is not None:
@@ -295,44 +291,9 @@ class OAK_GUI(QMainWindow):
             image = raw_frame
             predictions = result.get("predictions", [])
 
-            flavors_data = {}
-            self.flavor_coordinates.clear()
-
-            for prediction in predictions:
-                label = prediction.class_name
-                confidence = prediction.confidence
-                x, y = prediction.x, prediction.y
-
-                self.flavor_coordinates[label] = (x, y)
-
-                if label in flavors_data:
-                    flavors_data[label]['count'] += 1
-                    flavors_data[label]['total_confidence'] += confidence
-                else:
-                    flavors_data[label] = {'count': 1, 'total_confidence': confidence}
-            
-            flavor_stats = [(flavor, data['count'], data['total_confidence'] / data['count']) 
-                           for flavor, data in flavors_data.items()]
-            flavor_stats.sort(key=lambda x: (-x[2], -x[1]))
-
-            self.predictions_table.setRowCount(len(flavor_stats))
+            self.flavor_coordinates, self.flavor_confidences, flavor_stats = aggregate_predictions(predictions)
+            image = draw_markers(image, self.populate_table(flavor_stats))
 
-            for i, (flavor, count, avg_conf) in enumerate(flavor_stats):
-                coords = self.flavor_coordinates.get(flavor, ('N/A', 'N/A'))
-                text_size = cv2.getTextSize(flavor, cv2.FONT_HERSHEY_SIMPLEX, 1, 2)[0]
-                x = abs(int(640-coords[0]))
-                y = abs(int(640-coords[1]))
-
-                self.predictions_table.setItem(i, 0, QTableWidgetItem(flavor))
-                self.predictions_table.setItem(i, 1, QTableWidgetItem(f"{avg_conf:.2f}"))
-                self.predictions_table.setItem(i, 2, QTableWidgetItem(f"{x}, {y}"))
-
-                image = cv2.flip(image, 0)
-                image = cv2.flip(image, 1)
-                cv2.circle(image, (x,y), 8, (0,0,0))
-                image = cv2.flip(image, 0)
-                image = cv2.flip(image, 1)
-            
             height, width, channel = image.shape
             bytes_per_line = 3 * width
             image = cv2.flip(image, 0)
@@ -345,6 +306,7 @@ class OAK_GUI(QMainWindow):
 
     def closeEvent(self, event):
         arduino.close()
+        self.journal.close()
         event.accept()
 
 if __name__ == '__main__':
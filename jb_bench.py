@@ -0,0 +1,262 @@
+import argparse
+import contextlib
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from jb_gantry import MockArduino, pickup_sequence, send_gcode
+from jb_journal import PickJournal
+from jb_predictions import aggregate_predictions
+from jb_stations import ReplayFrameSource
+
+# Hardware-free benchmarks for the detect -> plan -> pick pipeline. Every run
+# writes a JSON report; with --baseline the fastest samples are compared against a
+# stored report and the script exits non-zero when anything got slower than
+# its threshold. Benchmarks whose dependencies (PyQt5, OpenCV) are missing are
+# reported as skipped; against a baseline that still fails the run unless
+# --allow-missing is given.
+#
+#   python jb_bench.py --save-baseline          # record bench_baseline.json
+#   python jb_bench.py --baseline               # compare a new run against it
+
+FLAVORS = [f"Flavor {i}" for i in range(50)]
+DEFAULT_THRESHOLD = 1.25
+
+def synthetic_frames(count, beans, seed=0):
+    # Predictions in the same shape as RoboflowOak, spread over a 640x640 frame
+    rng = random.Random(seed)
+    return [[{"class_name": rng.choice(FLAVORS), "confidence": rng.uniform(0.1, 1.0),
+              "x": rng.uniform(0, 640), "y": rng.uniform(0, 640)} for __ in range(beans)]
+            for __ in range(count)]
+
+def draining_frames(beans, seed=0):
+    # One fewer bean per frame so auto_pick empties the table and stops
+    frame = synthetic_frames(1, beans, seed)[0]
+    return [frame[:count] for count in range(beans, -1, -1)]
+
+class Benchmark:
+    def __init__(self, name, setup, number, requires=(), threshold=None):
+        # setup(stack) returns the callable to time and registers any cleanup
+        # on the ExitStack; number is calls per sample. threshold overrides the
+        # run-wide one for noisy (e.g. disk-bound) benchmarks and is saved with
+        # the baseline entry.
+        self.name = name
+        self.setup = setup
+        self.number = number
+        self.requires = requires
+        self.threshold = threshold
+
+    def prepare(self, stack):
+        func = self.setup(stack)
+        func()  # warm up
+        return func
+
+    def sample(self, func):
+        start = time.perf_counter()
+        for __ in range(self.number):
+            func()
+        return (time.perf_counter() - start) / self.number
+
+    def summarize(self, samples):
+        result = {'median': statistics.median(samples), 'min': min(samples),
+                  'mean': statistics.mean(samples), 'number': self.number, 'repeat': len(samples)}
+        if self.threshold:
+            result['threshold'] = self.threshold
+        return result
+
+def bench_pickup_sequence(stack):
+    points = [(bean["x"], bean["y"]) for bean in synthetic_frames(1, 1000)[0]]
+    return lambda: [pickup_sequence(x, y) for x, y in points]
+
+def bench_send_gcode(stack):
+    arduino = MockArduino()
+    commands = pickup_sequence(320, 320)
+    return lambda: [send_gcode(arduino, command) for command in commands]
+
+def bench_journal_write(stack):
+    # Times recording and committing, i.e. what actually reaches the disk
+    directory = stack.enter_context(tempfile.TemporaryDirectory())
+    journal = PickJournal(os.path.join(directory, "picks.db"))
+    stack.callback(journal.close)
+
+    def write():
+        for __ in range(1000):
+            journal.record("Flavor 0", True, station="bench", confidence=0.5,
+                           x=320, y=320, cycle_time=1.0)
+        journal.flush()
+    return write
+
+def bench_aggregate(stack):
+    frame = ReplayFrameSource(synthetic_frames(1, 200)).detect()[0]["predictions"]
+    return lambda: aggregate_predictions(frame)
+
+def bench_draw_markers(stack):
+    import numpy
+    from jb_overlay import draw_markers
+    image = numpy.zeros((640, 640, 3), numpy.uint8)
+    markers = [(int(bean["x"]), int(bean["y"])) for bean in synthetic_frames(1, 50)[0]]
+    return lambda: draw_markers(image, markers)
+
+def make_gui(stack, frames):
+    import numpy
+    import jb6_mock_main
+    from PyQt5.QtWidgets import QApplication
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    if QApplication.instance() is None:
+        make_gui.app = QApplication(sys.argv[:1])
+
+    # Never drive a real gantry or open a real camera from the benchmark
+    jb6_mock_main.arduino = MockArduino()
+    directory = stack.enter_context(tempfile.TemporaryDirectory())
+    jb6_mock_main.journal_path = os.path.join(directory, "picks.db")
+    source = ReplayFrameSource(frames, numpy.zeros((640, 640, 3), numpy.uint8))
+    gui = jb6_mock_main.OAK_GUI(frame_source=source)
+    stack.callback(gui.journal.close)
+    gui.timer.stop()
+    return gui
+
+def bench_populate_table(stack):
+    gui = make_gui(stack, [])
+    predictions = ReplayFrameSource(synthetic_frames(1, 200)).detect()[0]["predictions"]
+    gui.flavor_coordinates, gui.flavor_confidences, flavor_stats = aggregate_predictions(predictions)
+    return lambda: gui.populate_table(flavor_stats)
+
+def bench_update_frame(stack):
+    gui = make_gui(stack, synthetic_frames(10, 200))
+    gui.video_running = True
+    return gui.update_frame
+
+def bench_auto_pick(stack):
+    gui = make_gui(stack, draining_frames(20))
+
+    def cycle():
+        gui.roboflowoak.index = 0
+        gui.start_video()
+        gui.update_frame()
+        gui.auto_pick()
+        gui.timer.stop()
+    return cycle
+
+BENCHMARKS = [
+    Benchmark("pickup_sequence_x1000", bench_pickup_sequence, 20),
+    Benchmark("send_gcode_pickup", bench_send_gcode, 200),
+    Benchmark("journal_write_x1000", bench_journal_write, 5, threshold=1.5),
+    Benchmark("aggregate_predictions_200", bench_aggregate, 200),
+    Benchmark("draw_markers_50", bench_draw_markers, 20, requires=("cv2", "numpy")),
+    Benchmark("populate_table_200", bench_populate_table, 50, requires=("PyQt5", "cv2", "roboflowoak")),
+    Benchmark("update_frame_200", bench_update_frame, 20, requires=("PyQt5", "cv2", "numpy", "roboflowoak")),
+    Benchmark("auto_pick_20_beans", bench_auto_pick, 2, requires=("PyQt5", "cv2", "numpy", "roboflowoak")),
+]
+
+def missing_modules(names):
+    missing = []
+    for name in names:
+        try:
+            __import__(name)
+        except ImportError:
+            missing.append(name)
+    return missing
+
+def run(benchmarks, repeat):
+    report = {'created': time.time(), 'python': platform.python_version(),
+              'platform': platform.platform(), 'results': {}, 'skipped': {}}
+    active = []
+    for benchmark in benchmarks:
+        missing = missing_modules(benchmark.requires)
+        if missing:
+            report['skipped'][benchmark.name] = "missing " + ", ".join(missing)
+            print(f"{benchmark.name:<28} skipped (missing {', '.join(missing)})")
+        else:
+            active.append(benchmark)
+
+    # Samples are taken round-robin across benchmarks, so a stretch where the
+    # whole machine is slow costs each benchmark a few samples rather than all
+    # of them. MockArduino and the GUI print every command; keep that quiet.
+    samples = {benchmark.name: [] for benchmark in active}
+    with contextlib.ExitStack() as stack, open(os.devnull, "w") as devnull, \
+            contextlib.redirect_stdout(devnull):
+        funcs = [(benchmark, benchmark.prepare(stack)) for benchmark in active]
+        for __ in range(repeat):
+            for benchmark, func in funcs:
+                samples[benchmark.name].append(benchmark.sample(func))
+
+    for benchmark in active:
+        result = benchmark.summarize(samples[benchmark.name])
+        report['results'][benchmark.name] = result
+        print(f"{benchmark.name:<28} {result['min']*1e6:12.1f} us  (median {result['median']*1e6:.1f} us)")
+    return report
+
+def compare(report, baseline, threshold, only=None):
+    # A benchmark regresses when its fastest sample exceeds the baseline's by
+    # more than the threshold ratio; the minimum is far steadier between runs
+    # than the median. A baseline entry may carry its own "threshold".
+    # Baseline entries this run did not produce are returned as missing.
+    regressions = []
+    missing = []
+    for name in baseline['results']:
+        if name not in report['results'] and (not only or only in name):
+            missing.append(name)
+            reason = report['skipped'].get(name, "not run")
+            print(f"{name:<28} missing from this run ({reason})")
+    for name, result in report['results'].items():
+        stored = baseline['results'].get(name)
+        if not stored:
+            continue
+        ratio = result['min'] / stored['min']
+        limit = stored.get('threshold', threshold)
+        result['baseline_min'] = stored['min']
+        result['ratio'] = ratio
+        result['regressed'] = ratio > limit
+        if ratio > limit:
+            regressions.append(name)
+        print(f"{name:<28} {ratio:6.2f}x baseline" + ("  REGRESSION" if ratio > limit else ""))
+    return regressions, missing
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the detect -> plan -> pick pipeline without hardware")
+    parser.add_argument("--output", default="bench_results.json", help="where to write this run's report")
+    parser.add_argument("--baseline", nargs="?", const="bench_baseline.json", help="report to compare against")
+    parser.add_argument("--save-baseline", nargs="?", const="bench_baseline.json", help="also store this run as the baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="allowed slowdown ratio, default 1.25")
+    parser.add_argument("--repeat", type=int, default=15, help="samples per benchmark")
+    parser.add_argument("--only", help="run benchmarks whose name contains this text")
+    parser.add_argument("--allow-missing", action="store_true",
+                        help="pass even if baseline benchmarks were skipped or not run")
+    args = parser.parse_args(argv)
+
+    if args.baseline and not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --save-baseline first to record one")
+        return 2
+
+    benchmarks = [benchmark for benchmark in BENCHMARKS if not args.only or args.only in benchmark.name]
+    report = run(benchmarks, args.repeat)
+
+    regressions, missing = [], []
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions, missing = compare(report, json.load(f), args.threshold, args.only)
+        report['regressions'] = regressions
+        report['missing'] = missing
+
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump(report, f, indent=2)
+
+    failed = False
+    if regressions:
+        print(f"{len(regressions)} benchmark(s) regressed: {', '.join(regressions)}")
+        failed = True
+    if missing and not args.allow_missing:
+        print(f"{len(missing)} baseline benchmark(s) missing from this run: {', '.join(missing)}")
+        failed = True
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,65 @@
+import time
+
+# Default calibration for the single station on /dev/ttyACM0
+machine_dimensions = [(0, 3.45), (0, 3.6), (0, 0.325)]
+mmpp = [0.41, -0.41]
+offsets = [150, 262]
+
+class MockArduino:
+    def __init__(self, latency=0, quiet=False):
+        # latency simulates the time the gantry takes to answer each command
+        self.is_mock = True
+        self.latency = latency
+        self.quiet = quiet
+        if not quiet:
+            print("Initialized Mock Arduino for testing")
+
+    def write(self, command):
+        if not self.quiet:
+            print(f"Mock Arduino received command: {command.decode().strip()}")
+        return True
+
+    def readline(self):
+        if self.latency:
+            time.sleep(self.latency)
+        return b"ok\n"
+
+    def close(self):
+        if not self.quiet:
+            print("Mock Arduino connection closed")
+
+def open_arduino(port, baud_rate=9600):
+    # Raises serial.SerialException when the port can't be opened. pyserial is
+    # imported here so the mock and G-code helpers work without it.
+    import serial
+    arduino = serial.Serial(port, baud_rate)
+    print(f"Connected to real Arduino on {port}")
+    arduino.is_mock = False
+    return arduino
+
+def initialize_arduino(port="/dev/ttyACM0", baud_rate=9600):
+    import serial
+    try:
+        return open_arduino(port, baud_rate)
+    except serial.SerialException as e:
+        print(f"Arduino not found on {port}: {e}")
+        print("Initializing Mock Arduino for testing")
+        return MockArduino()
+
+def send_gcode(arduino, command, command_delay=1):
+    command = str.encode(command.strip() + '\n')
+    arduino.write(command)
+    response = arduino.readline()
+    if not getattr(arduino, 'is_mock', False):
+        time.sleep(command_delay)
+    return response.strip()
+
+def pickup_sequence(x, y, mmpp=mmpp, offsets=offsets, machine_dimensions=machine_dimensions):
+    return [
+        f"G01 x{((mmpp[0]*x)+offsets[0])/100} y{((mmpp[1]*y)+offsets[1])/100} f300",
+        "M08",
+        f"G01 z{machine_dimensions[2][1]} f300",
+        "G01 z0 f300",
+        "G01 x0 y0 f300",
+        "M09"
+    ]
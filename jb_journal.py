@@ -0,0 +1,148 @@
+import queue
+import sqlite3
+import threading
+import time
+
+# Append-only record of every pick. Writes go through a queue to a background
+# thread that commits them in batches, so recording a pick never waits on disk.
+# The two covering indexes let the per-flavor queries answer any time window
+# straight from the index, which keeps them fast at millions of rows.
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS picks (
+    id INTEGER PRIMARY KEY,
+    time REAL NOT NULL,
+    station TEXT,
+    flavor TEXT NOT NULL,
+    success INTEGER NOT NULL,
+    confidence REAL,
+    x INTEGER,
+    y INTEGER,
+    cycle_time REAL
+);
+CREATE INDEX IF NOT EXISTS picks_by_time ON picks (time, flavor, success, cycle_time);
+CREATE INDEX IF NOT EXISTS picks_by_flavor ON picks (flavor, time, success, cycle_time);
+"""
+
+COLUMNS = ("time", "station", "flavor", "success", "confidence", "x", "y", "cycle_time")
+
+def _connect(path):
+    connection = sqlite3.connect(path, check_same_thread=False)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    return connection
+
+class PickJournal:
+    def __init__(self, path="picks.db", batch_size=500):
+        self.path = path
+        self.batch_size = batch_size
+        self.pending = queue.Queue()
+        self.closed = False
+        self.error = None
+        # Rows lost to failed commits, and how many of those flush() has reported
+        self.dropped = 0
+        self.reported_dropped = 0
+
+        connection = _connect(path)
+        connection.executescript(SCHEMA)
+        connection.close()
+
+        # Readers get their own connection; WAL lets them run alongside the writer
+        self.reader = _connect(path)
+        self.reader_lock = threading.Lock()
+        self.writer = threading.Thread(target=self._write_loop, name="pick-journal", daemon=True)
+        self.writer.start()
+
+    def record(self, flavor, success, station=None, confidence=None, x=None, y=None,
+               started=None, cycle_time=None):
+        if self.closed:
+            raise RuntimeError("Pick journal is closed")
+        self.pending.put((started if started is not None else time.time(), station, flavor,
+                          int(bool(success)), confidence, x, y, cycle_time))
+
+    def _write_loop(self):
+        # The queue carries rows, flush markers (Events) and a final None
+        insert = f"INSERT INTO picks ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})"
+        connection = None
+        try:
+            connection = _connect(self.path)
+            running = True
+            while running:
+                batch = [self.pending.get()]
+                while len(batch) < self.batch_size:
+                    try:
+                        batch.append(self.pending.get_nowait())
+                    except queue.Empty:
+                        break
+
+                rows = [item for item in batch if isinstance(item, tuple)]
+                running = None not in batch
+                if rows:
+                    try:
+                        with connection:
+                            connection.executemany(insert, rows)
+                    except sqlite3.Error as e:
+                        self.error = e
+                        self.dropped += len(rows)
+                        print(f"Pick journal write failed, dropped {len(rows)} picks: {e}")
+                for item in batch:
+                    if isinstance(item, threading.Event):
+                        item.set()
+        except Exception as e:
+            self.error = e
+            print(f"Pick journal writer stopped: {e}")
+        finally:
+            if connection:
+                connection.close()
+
+    def flush(self, timeout=None):
+        # Block until everything recorded so far is committed; raises if any
+        # picks recorded since the last flush could not be written
+        if self.closed:
+            return
+        done = threading.Event()
+        self.pending.put(done)
+        deadline = None if timeout is None else time.time() + timeout
+        while not done.wait(0.1):
+            if not self.writer.is_alive() and not done.is_set():
+                raise RuntimeError(f"Pick journal writer stopped: {self.error}")
+            if deadline is not None and time.time() >= deadline:
+                raise TimeoutError("Pick journal did not flush in time")
+
+        lost = self.dropped - self.reported_dropped
+        self.reported_dropped = self.dropped
+        if lost:
+            raise RuntimeError(f"Pick journal dropped {lost} picks: {self.error}")
+
+    def close(self):
+        self.closed = True
+        if self.writer.is_alive():
+            self.pending.put(None)
+            self.writer.join()
+        self.reader.close()
+
+    def _query(self, select, start, end):
+        clauses, params = [], []
+        if start is not None:
+            clauses.append("time >= ?")
+            params.append(start)
+        if end is not None:
+            clauses.append("time < ?")
+            params.append(end)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        sql = f"SELECT flavor, {select} FROM picks{where} GROUP BY flavor ORDER BY flavor"
+        with self.reader_lock:
+            return self.reader.execute(sql, params).fetchall()
+
+    def flavor_counts(self, start=None, end=None):
+        # Successful picks per flavor, i.e. what ended up in the cup
+        return dict(self._query("SUM(success)", start, end))
+
+    def success_rates(self, start=None, end=None):
+        return {flavor: (successes / attempts, attempts)
+                for flavor, successes, attempts in self._query("SUM(success), COUNT(*)", start, end)}
+
+    def cycle_times(self, start=None, end=None):
+        return {flavor: {'average': average, 'min': fastest, 'max': slowest}
+                for flavor, average, fastest, slowest
+                in self._query("AVG(cycle_time), MIN(cycle_time), MAX(cycle_time)", start, end)}
@@ -0,0 +1,12 @@
+# Draws the pick markers onto a camera frame; needs only OpenCV.
+
+import cv2
+
+def draw_markers(image, markers):
+    for x, y in markers:
+        image = cv2.flip(image, 0)
+        image = cv2.flip(image, 1)
+        cv2.circle(image, (x,y), 8, (0,0,0))
+        image = cv2.flip(image, 0)
+        image = cv2.flip(image, 1)
+    return image
@@ -0,0 +1,28 @@
+# Turns a frame's predictions into the per-flavor view the GUI shows.
+# Pure Python so it can be used and benchmarked without the OAK or Qt stack.
+
+def aggregate_predictions(predictions):
+    # The coordinates and confidence kept per flavor belong to the same
+    # prediction, the one a pick of that flavor will go to
+    flavor_coordinates = {}
+    flavor_confidences = {}
+    flavors_data = {}
+
+    for prediction in predictions:
+        label = prediction.class_name
+        confidence = prediction.confidence
+        x, y = prediction.x, prediction.y
+
+        flavor_coordinates[label] = (x, y)
+        flavor_confidences[label] = confidence
+
+        if label in flavors_data:
+            flavors_data[label]['count'] += 1
+            flavors_data[label]['total_confidence'] += confidence
+        else:
+            flavors_data[label] = {'count': 1, 'total_confidence': confidence}
+
+    flavor_stats = [(flavor, data['count'], data['total_confidence'] / data['count'])
+                    for flavor, data in flavors_data.items()]
+    flavor_stats.sort(key=lambda x: (-x[2], -x[1]))
+    return flavor_coordinates, flavor_confidences, flavor_stats
@@ -0,0 +1,268 @@
+import collections
+import multiprocessing
+import queue
+import time
+import jb_gantry
+from jb_gantry import MockArduino, open_arduino, pickup_sequence, send_gcode
+
+# Runs several picking stations from one host. Each station is a camera/gantry
+# pair with its own device ID, serial port and calibration, driven by its own
+# worker process. The coordinator hands flavor orders to whichever station has
+# the shortest queue and aggregates the results, optionally into a PickJournal.
+
+class StationConfig:
+    def __init__(self, name, port, device=None, baud_rate=9600, command_delay=1,
+                 mmpp=None, offsets=None, machine_dimensions=None, replay=None,
+                 mock_latency=0, quiet=False):
+        # port=None uses a MockArduino (quiet silences it); a real port that
+        # fails to open is an error, never a silent mock. replay=[frame, ...]
+        # replaces the camera, each frame a list of
+        # {"class_name", "confidence", "x", "y"} dicts
+        self.name = name
+        self.device = device
+        self.port = port
+        self.baud_rate = baud_rate
+        self.command_delay = command_delay
+        self.mmpp = list(mmpp or jb_gantry.mmpp)
+        self.offsets = list(offsets or jb_gantry.offsets)
+        self.machine_dimensions = list(machine_dimensions or jb_gantry.machine_dimensions)
+        self.replay = replay
+        self.mock_latency = mock_latency
+        self.quiet = quiet
+
+    def connect(self):
+        if self.port is None:
+            return MockArduino(self.mock_latency, self.quiet)
+        return open_arduino(self.port, self.baud_rate)
+
+    def open_frame_source(self):
+        if self.replay is not None:
+            return ReplayFrameSource(self.replay)
+        # Imported here so mock stations don't need the OAK stack installed
+        from roboflowoak import RoboflowOak
+        return RoboflowOak(model="jellybelly5", confidence=0.10, overlap=0.5,
+                           version="1", api_key="##INSERT YOUR API KEY HERE###", rgb=True,
+                           depth=False, device=self.device, blocking=True)
+
+class ReplayPrediction:
+    def __init__(self, class_name, confidence, x, y):
+        self.class_name = class_name
+        self.confidence = confidence
+        self.x = x
+        self.y = y
+
+class ReplayFrameSource:
+    # Stands in for RoboflowOak by cycling through recorded predictions,
+    # optionally returning the same image as every frame
+    def __init__(self, frames, image=None):
+        self.frames = [[ReplayPrediction(**prediction) for prediction in frame] for frame in frames]
+        self.image = image
+        self.index = 0
+
+    def detect(self):
+        predictions = self.frames[self.index % len(self.frames)] if self.frames else []
+        self.index += 1
+        return {"predictions": predictions}, self.image, self.image, None
+
+def find_flavor(predictions, flavor):
+    best = None
+    for prediction in predictions:
+        if prediction.class_name == flavor and (best is None or prediction.confidence > best.confidence):
+            best = prediction
+    return best
+
+def station_worker(config, orders, results):
+    try:
+        run_station(config, orders, results)
+    except Exception as e:
+        # Tell the coordinator why this station stopped instead of vanishing
+        results.put({'station': config.name, 'error': f"{type(e).__name__}: {e}"})
+
+def run_station(config, orders, results):
+    arduino = config.connect()
+    source = config.open_frame_source()
+    send_gcode(arduino, "Wakeup... or else...", config.command_delay)
+
+    while True:
+        flavor = orders.get()
+        if flavor is None:
+            break
+
+        started = time.time()
+        result, __, __, __ = source.detect()
+        prediction = find_flavor(result.get("predictions", []), flavor)
+        pick = {'station': config.name, 'flavor': flavor, 'success': False,
+                'confidence': None, 'x': None, 'y': None, 'started': started}
+
+        if prediction:
+            x = abs(int(640-prediction.x))
+            y = abs(int(640-prediction.y))
+            success = True
+            for command in pickup_sequence(x, y, config.mmpp, config.offsets, config.machine_dimensions):
+                success = send_gcode(arduino, command, config.command_delay) == b"ok" and success
+            pick.update(success=success, confidence=prediction.confidence, x=x, y=y)
+
+        pick['finished'] = time.time()
+        pick['cycle_time'] = pick['finished'] - started
+        results.put(pick)
+
+    send_gcode(arduino, "G01 x0 y0 f300", config.command_delay)
+    arduino.close()
+
+class StationCoordinator:
+    # How often wait() wakes up to check that the stations are still alive
+    poll_interval = 0.5
+
+    # How long stop() gives the workers to finish before terminating them
+    stop_timeout = 10
+
+    def __init__(self, configs, journal=None):
+        names = [config.name for config in configs]
+        if len(set(names)) != len(names):
+            raise ValueError("Station names must be unique")
+        # Two stations can't share a serial port or a camera
+        ports = [config.port for config in configs if config.port is not None]
+        if len(set(ports)) != len(ports):
+            raise ValueError("Station serial ports must be unique")
+        devices = [config.device for config in configs if config.replay is None and config.device is not None]
+        if len(set(devices)) != len(devices):
+            raise ValueError("Station camera devices must be unique")
+        self.configs = configs
+        self.journal = journal
+        self.results = multiprocessing.Queue()
+        self.orders = {}
+        self.workers = {}
+        # Flavors sent to each station but not reported back yet, oldest first
+        self.pending = {name: collections.deque() for name in names}
+        self.failed = {}
+        self.completed = []
+        self.started = None
+
+    def start(self):
+        for config in self.configs:
+            orders = multiprocessing.Queue()
+            worker = multiprocessing.Process(target=station_worker, args=(config, orders, self.results),
+                                             name=f"station-{config.name}", daemon=True)
+            worker.start()
+            self.orders[config.name] = orders
+            self.workers[config.name] = worker
+        self.started = time.time()
+
+    def submit(self, flavor):
+        if not self.workers:
+            raise RuntimeError("Stations are not running, call start() first")
+
+        # Route to the live station with the fewest outstanding orders
+        self.check_stations()
+        live = [name for name in self.pending if name not in self.failed]
+        if not live:
+            raise RuntimeError(f"Every station has failed: {self.failed}")
+        name = min(live, key=lambda name: len(self.pending[name]))
+        self.orders[name].put(flavor)
+        self.pending[name].append(flavor)
+        return name
+
+    def _record(self, pick):
+        if pick['station'] in self.failed:
+            # Its outstanding orders were already failed, nothing left to match
+            print(f"Ignoring late result from failed station {pick['station']}: {pick}")
+            return
+        if 'error' in pick:
+            self._fail_station(pick['station'], pick['error'])
+            return
+        self._complete(pick)
+
+    def _complete(self, pick):
+        self.pending[pick['station']].popleft()
+        self.completed.append(pick)
+        if self.journal:
+            self.journal.record(pick['flavor'], pick['success'], station=pick['station'],
+                                confidence=pick['confidence'], x=pick['x'], y=pick['y'],
+                                started=pick['started'], cycle_time=pick['cycle_time'])
+
+    def _fail_station(self, name, reason):
+        # Stop routing to the station and fail whatever it still owed us
+        print(f"Station {name} failed: {reason}")
+        self.failed[name] = reason
+        now = time.time()
+        for flavor in list(self.pending[name]):
+            self._complete({'station': name, 'flavor': flavor, 'success': False,
+                          'confidence': None, 'x': None, 'y': None, 'started': now,
+                          'finished': now, 'cycle_time': 0.0})
+
+    def collect(self):
+        while True:
+            try:
+                self._record(self.results.get_nowait())
+            except queue.Empty:
+                return
+
+    def check_stations(self):
+        self.collect()
+        for name, worker in self.workers.items():
+            if name not in self.failed and not worker.is_alive():
+                # Pick up anything it posted between the collect above and exiting
+                self.collect()
+                if name not in self.failed:
+                    self._fail_station(name, f"worker exited with code {worker.exitcode}")
+
+    def wait(self, timeout=None):
+        deadline = None if timeout is None else time.time() + timeout
+        while any(self.pending.values()):
+            if deadline is not None and time.time() >= deadline:
+                raise TimeoutError("Stations did not finish their orders in time")
+            wait_for = self.poll_interval if deadline is None else min(self.poll_interval, deadline - time.time())
+            try:
+                self._record(self.results.get(timeout=max(0, wait_for)))
+            except queue.Empty:
+                self.check_stations()
+        return self.completed
+
+    def stop(self):
+        for name, orders in self.orders.items():
+            if name not in self.failed:
+                orders.put(None)
+        deadline = time.time() + self.stop_timeout
+        for name, worker in self.workers.items():
+            worker.join(max(0, deadline - time.time()))
+            if worker.is_alive():
+                print(f"Station {name} did not stop, terminating it")
+                worker.terminate()
+                worker.join()
+        self.orders.clear()
+        self.workers.clear()
+
+    def throughput(self):
+        stations = {}
+        for name in self.pending:
+            picks = [pick for pick in self.completed if pick['station'] == name]
+            stations[name] = {'picks': len(picks),
+                              'successes': sum(1 for pick in picks if pick['success'])}
+            if name in self.failed:
+                stations[name]['error'] = self.failed[name]
+
+        finished = max((pick['finished'] for pick in self.completed), default=self.started)
+        elapsed = finished - self.started if self.started else 0
+        total = len(self.completed)
+        return {'stations': stations, 'picks': total, 'elapsed': elapsed,
+                'picks_per_second': total / elapsed if elapsed else 0.0}
+
+if __name__ == '__main__':
+    # Mock scaling demo: same orders, increasing number of stations
+    frames = [[{"class_name": "Buttered Popcorn", "confidence": 0.9, "x": 320, "y": 320},
+               {"class_name": "Very Cherry", "confidence": 0.8, "x": 200, "y": 400}]]
+    orders = ["Buttered Popcorn", "Very Cherry"] * 12
+
+    for count in (1, 2, 4):
+        configs = [StationConfig(f"oak{i}", None, device=i, replay=frames,
+                                 mock_latency=0.01, quiet=True)
+                   for i in range(count)]
+        coordinator = StationCoordinator(configs)
+        coordinator.start()
+        for flavor in orders:
+            coordinator.submit(flavor)
+        coordinator.wait()
+        coordinator.stop()
+        stats = coordinator.throughput()
+        print(f"{count} station(s): {stats['picks']} picks in {stats['elapsed']:.2f}s "
+              f"({stats['picks_per_second']:.1f} picks/s)")